@@ -1,11 +1,14 @@
+import io
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sqlite3
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
-import json
+from typing import Optional
 
 # --- 页面配置 ---
 st.set_page_config(
@@ -19,6 +22,22 @@ st.set_page_config(
 DB_FILE = "news.db"  # 与主程序保持一致
 CACHE_TTL = 300  # 5分钟缓存
 
+# 查询投影: 缺失值默认值直接用COALESCE在SQL里补齐，省掉加载后逐列fillna重写
+ARTICLE_COLUMNS_SQL = """
+    title, url, source, publish_date,
+    COALESCE(author, '未知') AS author,
+    COALESCE(sub_category, '未分类') AS sub_category,
+    COALESCE(category, '未分类') AS category,
+    COALESCE(summary, '') AS summary,
+    COALESCE(keywords, '') AS keywords,
+    CAST(COALESCE(value_score, 0) AS INTEGER) AS value_score,
+    COALESCE(value_reason, '未评估') AS value_reason,
+    created_at
+"""
+
+# 时间列在C层读取时直接解析 (publish_date 可能是'未知'等脏值，宽容解析为NaT)
+PARSE_DATES = {'created_at': {}, 'publish_date': {'errors': 'coerce'}}
+
 # --- 自定义CSS ---
 def load_custom_css():
     """加载自定义CSS样式"""
@@ -98,6 +117,26 @@ def load_custom_css():
         font-size: 0.9rem;
     }
     
+    /* AI评估理由框样式 */
+    .reason-box {
+        background-color: #e8f4f8;
+        padding: 0.75rem 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+        color: #0c5460;
+    }
+
+    /* 卡片详情折叠样式 */
+    .article-details {
+        margin: 0.5rem 0 1rem 0;
+    }
+
+    .article-details summary {
+        cursor: pointer;
+        color: #1976d2;
+        font-size: 0.9rem;
+    }
+
     /* 统计卡片样式 */
     .stat-card {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -120,78 +159,237 @@ def load_custom_css():
     """
     st.markdown(css, unsafe_allow_html=True)
 
+def _df_fingerprint(df: pd.DataFrame) -> tuple:
+    """廉价的DataFrame指纹: 行数+最新收录时间即可唯一标识一次快照，避免O(N)整帧哈希"""
+    return (len(df), str(df['created_at'].iat[0]) if len(df) else '')
+
+
 # --- 数据库管理类 ---
+@st.cache_resource
+def get_connection(db_path: str) -> sqlite3.Connection:
+    """获取全局复用的SQLite连接 (资源缓存与数据缓存分离，避免每次查询都重新建连)
+
+    以只读模式打开: dashboard 永不写库，query_only 防止误写，
+    mmap 让热点页留在页缓存中降低读延迟。WAL 由写入方 main.py 启用，
+    只读连接会自动沿用，采集程序写入时不会阻塞这里的读取。
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")  # 64MB页缓存，热点页跨重跑常驻
+    conn.execute("PRAGMA query_only=1")
+    return conn
+
+
 class DatabaseManager:
     """数据库管理类"""
-    
+
     def __init__(self, db_path: str):
         self.db_path = db_path
-        
+
     def check_database_exists(self) -> bool:
         """检查数据库文件是否存在"""
         return Path(self.db_path).exists()
-    
-    @st.cache_data(ttl=CACHE_TTL)
-    def load_articles(_self) -> pd.DataFrame:
-        """加载文章数据"""
+
+    @st.cache_data(ttl=CACHE_TTL, max_entries=2, persist="disk", show_spinner=False)
+    def load_articles_light(_self) -> pd.DataFrame:
+        """加载统计/分析页所需的窄投影
+
+        总览和数据分析页只消费这5列；情报列表页的完整行走 query_articles 按需取。
+        相比全列加载，统计路径的I/O和内存大约减半。
+        """
         if not _self.check_database_exists():
             return pd.DataFrame()
-            
+
         try:
-            with sqlite3.connect(_self.db_path) as conn:
-                query = """
-                SELECT 
-                    id, title, url, source, publish_date, author,
-                    sub_category, category, summary, keywords,
-                    value_score, value_reason, created_at
-                FROM articles
-                ORDER BY created_at DESC
-                """
-                df = pd.read_sql_query(query, conn)
-                
-                # 数据类型转换和清洗
-                df['created_at'] = pd.to_datetime(df['created_at'])
-                df['publish_date'] = pd.to_datetime(df['publish_date'], errors='coerce')
-                
-                # 填充缺失值
-                df.fillna({
-                    'author': '未知',
-                    'value_score': 0,
-                    'value_reason': '未评估',
-                    'sub_category': '未分类',
-                    'category': '未分类',
-                    'keywords': ''
-                }, inplace=True)
-                
-                df['value_score'] = df['value_score'].astype(int)
-                
-                return df
-                
+            query = """
+            SELECT
+                created_at,
+                CAST(COALESCE(value_score, 0) AS INTEGER) AS value_score,
+                COALESCE(category, '未分类') AS category,
+                COALESCE(sub_category, '未分类') AS sub_category,
+                COALESCE(keywords, '') AS keywords
+            FROM articles
+            ORDER BY created_at DESC
+            """
+            df = pd.read_sql_query(
+                query, get_connection(_self.db_path), parse_dates={'created_at': {}}
+            )
+            return _self._narrow_dtypes(df)
+
         except Exception as e:
             st.error(f"加载数据库失败: {e}")
             return pd.DataFrame()
     
-    @st.cache_data(ttl=CACHE_TTL)
+    def _fts_enabled(_self) -> bool:
+        """检查FTS5全文索引表是否已由采集程序创建"""
+        row = get_connection(_self.db_path).execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='articles_fts'"
+        ).fetchone()
+        return row is not None
+
+    def _build_where(_self, filters: dict) -> tuple:
+        """把侧边栏筛选条件编译为参数化的WHERE子句，供查询和计数共用"""
+        conditions = []
+        params = []
+
+        # 文本搜索: 优先走FTS5全文索引 (trigram分词要求至少3个字符)，否则回退LIKE扫描
+        if filters['search_term']:
+            term = filters['search_term']
+            if len(term) >= 3 and _self._fts_enabled():
+                conditions.append("id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+                params.append('"{}"'.format(term.replace('"', '""')))
+            else:
+                like_term = f"%{term}%"
+                conditions.append("(title LIKE ? OR summary LIKE ? OR keywords LIKE ?)")
+                params.extend([like_term, like_term, like_term])
+
+        # 分类筛选
+        if filters['sub_category'] != '全部':
+            conditions.append("sub_category = ?")
+            params.append(filters['sub_category'])
+        if filters['category'] != '全部':
+            conditions.append("category = ?")
+            params.append(filters['category'])
+
+        # 价值评分筛选
+        conditions.append("value_score BETWEEN ? AND ?")
+        params.extend([filters['score_range'][0], filters['score_range'][1]])
+
+        # 时间筛选 (created_at 以 'YYYY-MM-DD HH:MM:SS' 文本存储，可直接做字符串比较)
+        if filters['time_option'] == "自定义" and filters['date_range'] and len(filters['date_range']) == 2:
+            start_date = pd.to_datetime(filters['date_range'][0])
+            end_date = pd.to_datetime(filters['date_range'][1]) + timedelta(days=1)
+            conditions.append("created_at >= ? AND created_at < ?")
+            params.extend([start_date.strftime('%Y-%m-%d %H:%M:%S'), end_date.strftime('%Y-%m-%d %H:%M:%S')])
+        elif filters['time_days'] > 0:
+            cutoff_date = datetime.now() - timedelta(days=filters['time_days'])
+            conditions.append("created_at >= ?")
+            params.append(cutoff_date.strftime('%Y-%m-%d %H:%M:%S'))
+
+        return " AND ".join(conditions), params
+
+    @st.cache_data(ttl=CACHE_TTL, max_entries=64)
+    def count_articles(_self, filters: dict) -> int:
+        """统计筛选结果总数 (分页只需要COUNT(*)，不必拉取整个结果集)"""
+        if not _self.check_database_exists():
+            return 0
+        where, params = _self._build_where(filters)
+        try:
+            row = get_connection(_self.db_path).execute(
+                f"SELECT COUNT(*) FROM articles WHERE {where}", params
+            ).fetchone()
+            return row[0]
+        except Exception as e:
+            st.error(f"查询数据库失败: {e}")
+            return 0
+
+    @st.cache_data(ttl=CACHE_TTL, max_entries=64)
+    def query_articles(_self, filters: dict, limit: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
+        """按筛选条件在SQL层查询文章 (谓词/投影下推，避免全表加载后再用pandas过滤)
+
+        limit/offset 把分页也下推到SQL: 卡片视图每次只取当前页的行。
+        结果以(筛选条件, 页码)为键缓存，来回切换时直接命中。
+        """
+        if not _self.check_database_exists():
+            return pd.DataFrame()
+
+        where, params = _self._build_where(filters)
+
+        # 排序同样下推到SQL
+        if filters['sort_by'] == 'value_score':
+            order_by = "value_score DESC, created_at DESC"
+        elif filters['sort_by'] == 'publish_date':
+            # '未知'/NULL 的发布时间排在最后
+            order_by = "(publish_date IS NULL OR publish_date = '未知'), publish_date DESC"
+        else:  # created_at
+            order_by = "created_at DESC"
+
+        query = f"SELECT {ARTICLE_COLUMNS_SQL} FROM articles WHERE {where} ORDER BY {order_by}"
+
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params = params + [limit, offset]
+
+        try:
+            df = pd.read_sql_query(
+                query, get_connection(_self.db_path), params=params, parse_dates=PARSE_DATES
+            )
+            return _self._narrow_dtypes(df)
+        except Exception as e:
+            st.error(f"查询数据库失败: {e}")
+            return pd.DataFrame()
+
+    @staticmethod
+    def _narrow_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """收窄列类型 (缺失值填充与时间解析已分别由COALESCE和parse_dates处理)"""
+        if df.empty:
+            return df
+
+        # 低基数文本列转 category，大幅压缩内存并加速等值过滤/unique
+        # (窄投影和全列投影共用此函数，列不在时跳过)
+        for col in ('sub_category', 'category', 'source', 'author'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        # 长文本列改用Arrow字符串存储: 连续缓冲区代替逐格的Python str对象
+        for col in ('title', 'url', 'summary', 'keywords', 'value_reason'):
+            if col in df.columns:
+                df[col] = df[col].astype('string[pyarrow]')
+        df['value_score'] = df['value_score'].astype('int16')
+        return df
+
+    @st.cache_data(ttl=CACHE_TTL, max_entries=4, hash_funcs={pd.DataFrame: _df_fingerprint})
     def get_statistics(_self, df: pd.DataFrame) -> dict:
         """计算统计数据"""
         if df.empty:
             return {}
             
+        # 时间与评分的聚合统一在numpy层单遍完成，避免反复物化 .dt.date 对象数组
+        timestamps = df['created_at'].values
+        days = timestamps.astype('datetime64[D]')
+        today = np.datetime64(datetime.now().date())
+        week_cutoff = np.datetime64(datetime.now() - timedelta(days=7))
+        unique_days, day_counts = np.unique(days, return_counts=True)
+        scores = df['value_score'].to_numpy()
+
         stats = {
             'total_articles': len(df),
-            'high_value_articles': len(df[df['value_score'] >= 70]),
-            'articles_today': len(df[df['created_at'].dt.date == datetime.now().date()]),
-            'articles_this_week': len(df[df['created_at'] >= datetime.now() - timedelta(days=7)]),
-            'avg_value_score': df['value_score'].mean(),
+            'high_value_articles': int((scores >= 70).sum()),
+            'articles_today': int((days == today).sum()),
+            'articles_this_week': int((timestamps >= week_cutoff).sum()),
+            'avg_value_score': float(scores.mean()),
             'top_categories': df['category'].value_counts().head(3).to_dict(),
             'top_subcategories': df['sub_category'].value_counts().head(5).to_dict(),
-            'articles_by_date': df.groupby(df['created_at'].dt.date).size().to_dict(),
-            'score_distribution': df['value_score'].value_counts().sort_index().to_dict()
+            'articles_by_date': dict(zip(unique_days.tolist(), day_counts.tolist())),
+            # 价值档位直接按三个区间向量化计数，省掉 value_counts 哈希和渲染端的逐桶循环
+            'score_buckets': {
+                '高价值 (≥70)': int((scores >= 70).sum()),
+                '中价值 (40-69)': int(((scores >= 40) & (scores < 70)).sum()),
+                '低价值 (<40)': int((scores < 40).sum()),
+            }
         }
-        
+
         return stats
 
 # --- UI组件函数 ---
+@st.cache_data(ttl=CACHE_TTL, max_entries=4, hash_funcs={pd.DataFrame: _df_fingerprint})
+def compute_analysis_aggregates(df: pd.DataFrame) -> dict:
+    """预计算数据分析页的全部聚合，切换标签页/侧边栏交互时直接命中缓存"""
+    keywords = df['keywords'].dropna().str.split(r'\s*,\s*', regex=True).explode().str.strip()
+    keywords = keywords[keywords != '']
+    return {
+        'category_counts': df['category'].value_counts(),
+        'subcategory_counts': df['sub_category'].value_counts().head(10),
+        'heatmap_data': (
+            df.groupby(['category', 'sub_category'], observed=True)['value_score']
+            .mean()
+            .unstack()
+        ),
+        'keyword_counts': keywords.value_counts().head(20),
+        'unique_keywords': int(keywords.nunique()),
+        'avg_keywords_per_article': len(keywords) / len(df) if len(df) else 0.0,
+    }
+
+
 def render_statistics_dashboard(stats: dict):
     """渲染统计仪表板"""
     if not stats:
@@ -244,7 +442,13 @@ def render_statistics_dashboard(stats: dict):
         if stats['articles_by_date']:
             dates = list(stats['articles_by_date'].keys())
             counts = list(stats['articles_by_date'].values())
-            
+
+            # 历史很长时降采样为周粒度，控制发给浏览器的点数和Plotly绘制成本
+            if len(dates) > 500:
+                weekly = pd.Series(counts, index=pd.to_datetime(dates)).resample('W').sum()
+                dates = weekly.index.tolist()
+                counts = weekly.tolist()
+
             fig = go.Figure()
             fig.add_trace(go.Scatter(
                 x=dates, y=counts,
@@ -266,18 +470,9 @@ def render_statistics_dashboard(stats: dict):
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        # 价值分布饼图
-        if stats['score_distribution']:
-            # 将分数分组
-            score_groups = {'高价值 (≥70)': 0, '中价值 (40-69)': 0, '低价值 (<40)': 0}
-            for score, count in stats['score_distribution'].items():
-                if score >= 70:
-                    score_groups['高价值 (≥70)'] += count
-                elif score >= 40:
-                    score_groups['中价值 (40-69)'] += count
-                else:
-                    score_groups['低价值 (<40)'] += count
-            
+        # 价值分布饼图 (分组已在统计阶段向量化完成)
+        score_groups = stats['score_buckets']
+        if any(score_groups.values()):
             fig = go.Figure(data=[go.Pie(
                 labels=list(score_groups.keys()),
                 values=list(score_groups.values()),
@@ -293,32 +488,40 @@ def render_statistics_dashboard(stats: dict):
             
             st.plotly_chart(fig, use_container_width=True)
 
-def render_article_card(row):
-    """渲染文章卡片"""
-    # 价值评分样式
+def prepare_card_columns(page_df: pd.DataFrame) -> pd.DataFrame:
+    """为当前页的卡片批量预计算展示字符串，渲染循环内不再做逐行格式化"""
+    tier = pd.cut(page_df['value_score'], bins=[-1, 39, 69, 100], labels=['low', 'medium', 'high'])
+
+    # 关键词标签HTML向量化生成: 一次正则替换把逗号变成闭合/开启标签对
+    keywords = page_df['keywords'].str.replace(r'^[\s,]+|[\s,]+$', '', regex=True)
+    keywords_html = (
+        '<span class="keyword">'
+        + keywords.str.replace(r'\s*,\s*', '</span> <span class="keyword">', regex=True)
+        + '</span>'
+    ).where(keywords != '', '')
+
+    return page_df.assign(
+        created_time=page_df['created_at'].dt.strftime('%Y-%m-%d %H:%M'),
+        publish_date_str=page_df['publish_date'].dt.strftime('%Y-%m-%d').fillna('未知'),
+        score_class=tier.map({'low': 'value-score-low', 'medium': 'value-score-medium', 'high': 'value-score-high'}),
+        score_emoji=tier.map({'low': '📄', 'medium': '💡', 'high': '🔥'}),
+        keywords_html=keywords_html,
+    )
+
+
+def build_article_card_html(row: dict) -> str:
+    """生成单张文章卡片的HTML片段 (row 为普通字典，由 to_dict('records') 批量生成)
+
+    返回纯HTML而不直接调用 st.* : 整页卡片拼接后由一次 st.markdown 发送，
+    每次重跑的WebSocket消息数从每卡片4-5条降到每页1条。
+    """
     score = row['value_score']
-    if score >= 70:
-        score_class = "value-score-high"
-        emoji = "🔥"
-    elif score >= 40:
-        score_class = "value-score-medium"
-        emoji = "💡"
-    else:
-        score_class = "value-score-low"
-        emoji = "📄"
-    
-    # 发布时间处理
-    publish_date_str = "未知"
-    if pd.notna(row['publish_date']) and row['publish_date'] != '未知':
-        try:
-            publish_date_str = pd.to_datetime(row['publish_date']).strftime('%Y-%m-%d')
-        except:
-            publish_date_str = str(row['publish_date'])
-    
-    created_time = row['created_at'].strftime('%Y-%m-%d %H:%M')
-    
-    # 渲染卡片
-    st.markdown(f"""
+    score_class = row['score_class']
+    emoji = row['score_emoji']
+    publish_date_str = row['publish_date_str']
+    created_time = row['created_time']
+
+    parts = [f"""
     <div class="article-card">
         <div style="display: flex; justify-content: space-between; align-items: start;">
             <div style="flex: 1;">
@@ -337,28 +540,24 @@ def render_article_card(row):
             </div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
-    
+    """]
+
     # AI评估理由
     if row['value_reason']:
-        st.info(f"💭 **AI评估**: {row['value_reason']}")
-    
-    # 展开详情
-    with st.expander("查看详细信息"):
-        if row['summary']:
-            st.markdown(f"""
-            <div class="summary-box">
-                <strong>摘要</strong><br>
-                {row['summary']}
-            </div>
-            """, unsafe_allow_html=True)
-        
-        if row['keywords']:
-            keywords_html = ' '.join([f'<span class="keyword">{kw.strip()}</span>' 
-                                     for kw in row['keywords'].split(',') if kw.strip()])
-            st.markdown(f"**关键词**: {keywords_html}", unsafe_allow_html=True)
-        
-        st.markdown(f"🔗 **原文链接**: [{row['url']}]({row['url']})")
+        parts.append(f'<div class="reason-box">💭 <strong>AI评估</strong>: {row["value_reason"]}</div>')
+
+    # 展开详情 (原生 <details>，不再为每张卡片创建 st.expander 组件)
+    detail_parts = []
+    if row['summary']:
+        detail_parts.append(f'<div class="summary-box"><strong>摘要</strong><br>{row["summary"]}</div>')
+    if row['keywords_html']:
+        detail_parts.append(f'<p><strong>关键词</strong>: {row["keywords_html"]}</p>')
+    detail_parts.append(f'<p>🔗 <strong>原文链接</strong>: <a href="{row["url"]}" target="_blank">{row["url"]}</a></p>')
+    parts.append(
+        '<details class="article-details"><summary>查看详细信息</summary>{}</details>'.format(''.join(detail_parts))
+    )
+
+    return ''.join(parts)
 
 def render_sidebar_filters(df):
     """渲染侧边栏筛选器"""
@@ -388,8 +587,8 @@ def render_sidebar_filters(df):
     # 分类筛选
     st.sidebar.subheader("📁 分类筛选")
     
-    # 子分类
-    sub_categories = ['全部'] + sorted(df['sub_category'].unique().tolist())
+    # 子分类 (category dtype 的类目表是现成的元数据，不需要O(N)扫描去重)
+    sub_categories = ['全部'] + sorted(df['sub_category'].cat.categories.tolist())
     selected_sub_category = st.sidebar.selectbox(
         "产品/品牌",
         sub_categories,
@@ -397,7 +596,7 @@ def render_sidebar_filters(df):
     )
     
     # 信息类别
-    categories = ['全部'] + sorted(df['category'].unique().tolist())
+    categories = ['全部'] + sorted(df['category'].cat.categories.tolist())
     selected_category = st.sidebar.selectbox(
         "信息类别",
         categories,
@@ -467,54 +666,189 @@ def render_sidebar_filters(df):
         'date_range': date_range
     }
 
-def apply_filters(df, filters):
-    """应用筛选条件"""
-    filtered_df = df.copy()
-    
-    # 文本搜索
-    if filters['search_term']:
-        search_term = filters['search_term']
-        mask = (
-            filtered_df['title'].str.contains(search_term, case=False, na=False) |
-            filtered_df['summary'].str.contains(search_term, case=False, na=False) |
-            filtered_df['keywords'].str.contains(search_term, case=False, na=False)
+# --- 标签页fragment ---
+# 包成 st.fragment 后，fragment内部的交互 (翻页、切换视图、选中表格行)
+# 只重跑所属片段，不再触发整个脚本重跑和其他标签页的重建
+@st.fragment
+def render_overview_tab(db_manager: DatabaseManager, df: pd.DataFrame):
+    """数据总览页"""
+    # 显示统计仪表板
+    stats = db_manager.get_statistics(df)
+    render_statistics_dashboard(stats)
+
+
+@st.fragment
+def render_article_list(db_manager: DatabaseManager, filters: dict):
+    """情报列表页主体 (侧边栏筛选器在fragment外渲染，变化时正常全量重跑)"""
+    # 结果总数只需COUNT(*)，不必拉取整个结果集
+    total_count = db_manager.count_articles(filters)
+
+    # 显示结果统计
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        st.markdown(f"### 🔍 找到 **{total_count}** 条相关情报")
+    with col2:
+        # 导出按钮: 直接写入BytesIO (C层写出+一次性BOM)，并且不再藏在
+        # st.button 后面——那种两段式写法要点两次且第二次重跑后按钮即消失
+        csv_buf = io.BytesIO()
+        csv_buf.write(b'\xef\xbb\xbf')
+        db_manager.query_articles(filters).to_csv(csv_buf, index=False, encoding='utf-8')
+        st.download_button(
+            label="📥 导出数据",
+            data=csv_buf.getvalue(),
+            file_name=f'情报导出_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+            mime='text/csv',
+            use_container_width=True
         )
-        filtered_df = filtered_df[mask]
-    
-    # 分类筛选
-    if filters['sub_category'] != '全部':
-        filtered_df = filtered_df[filtered_df['sub_category'] == filters['sub_category']]
-    
-    if filters['category'] != '全部':
-        filtered_df = filtered_df[filtered_df['category'] == filters['category']]
-    
-    # 价值评分筛选
-    filtered_df = filtered_df[
-        (filtered_df['value_score'] >= filters['score_range'][0]) &
-        (filtered_df['value_score'] <= filters['score_range'][1])
-    ]
-    
-    # 时间筛选
-    if filters['time_option'] == "自定义" and filters['date_range'] and len(filters['date_range']) == 2:
-        start_date = pd.to_datetime(filters['date_range'][0])
-        end_date = pd.to_datetime(filters['date_range'][1]) + timedelta(days=1)
-        filtered_df = filtered_df[
-            (filtered_df['created_at'] >= start_date) &
-            (filtered_df['created_at'] < end_date)
-        ]
-    elif filters['time_days'] > 0:
-        cutoff_date = datetime.now() - timedelta(days=filters['time_days'])
-        filtered_df = filtered_df[filtered_df['created_at'] >= cutoff_date]
-    
-    # 排序
-    if filters['sort_by'] == 'value_score':
-        filtered_df = filtered_df.sort_values(by=['value_score', 'created_at'], ascending=[False, False])
-    elif filters['sort_by'] == 'publish_date':
-        filtered_df = filtered_df.sort_values(by='publish_date', ascending=False, na_position='last')
-    else:  # created_at
-        filtered_df = filtered_df.sort_values(by='created_at', ascending=False)
-    
-    return filtered_df
+
+    st.markdown("---")
+
+    # 显示文章列表
+    if total_count == 0:
+        st.info("😅 没有找到符合条件的情报，试试调整筛选条件？")
+    elif st.radio(
+        "展示方式", ["📋 卡片视图", "🗂️ 表格视图"],
+        horizontal=True, label_visibility="collapsed"
+    ) == "🗂️ 表格视图":
+        # 表格视图: st.dataframe 自带行虚拟化，一个组件渲染全部结果，
+        # 选中某一行时才渲染完整卡片详情
+        filtered_df = db_manager.query_articles(filters)
+        event = st.dataframe(
+            filtered_df[['title', 'sub_category', 'category', 'source', 'value_score', 'created_at']],
+            column_config={
+                'title': st.column_config.TextColumn("标题", width="large"),
+                'sub_category': st.column_config.TextColumn("产品/品牌"),
+                'category': st.column_config.TextColumn("信息类别"),
+                'source': st.column_config.TextColumn("来源"),
+                'value_score': st.column_config.ProgressColumn(
+                    "运营价值", min_value=0, max_value=100, format="%d"
+                ),
+                'created_at': st.column_config.DatetimeColumn("收录时间", format="YYYY-MM-DD HH:mm"),
+            },
+            hide_index=True,
+            use_container_width=True,
+            height=600,
+            on_select="rerun",
+            selection_mode="single-row",
+        )
+        if event.selection.rows:
+            st.markdown("---")
+            selected = prepare_card_columns(filtered_df.iloc[event.selection.rows])
+            st.markdown(build_article_card_html(selected.to_dict('records')[0]), unsafe_allow_html=True)
+    else:
+        # 分页显示: 分页下推到SQL (LIMIT/OFFSET)，每次重跑只取并渲染当前页
+        items_per_page = 10
+        total_pages = (total_count - 1) // items_per_page + 1
+
+        if 'page' not in st.session_state:
+            st.session_state.page = 0
+
+        # 筛选条件变化时回到第一页，避免停留在一个越界/无意义的页码上
+        filters_key = repr(sorted(filters.items(), key=lambda kv: kv[0]))
+        if st.session_state.get('filters_key') != filters_key:
+            st.session_state.filters_key = filters_key
+            st.session_state.page = 0
+
+        # 分页控制
+        col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
+        with col1:
+            if st.button("⬅️ 首页", disabled=st.session_state.page == 0):
+                st.session_state.page = 0
+        with col2:
+            if st.button("◀️ 上一页", disabled=st.session_state.page == 0):
+                st.session_state.page -= 1
+        with col3:
+            st.markdown(f"<center>第 {st.session_state.page + 1} / {total_pages} 页</center>", unsafe_allow_html=True)
+        with col4:
+            if st.button("下一页 ▶️", disabled=st.session_state.page >= total_pages - 1):
+                st.session_state.page += 1
+        with col5:
+            if st.button("末页 ➡️", disabled=st.session_state.page >= total_pages - 1):
+                st.session_state.page = total_pages - 1
+
+        # 显示当前页的文章: 只从数据库取这一页的行
+        # 用 to_dict('records') 代替逐行 .iloc 索引，避免每行构造一个 pd.Series
+        page_df = db_manager.query_articles(
+            filters, limit=items_per_page, offset=st.session_state.page * items_per_page
+        )
+
+        # 展示字符串 (时间、评分档位等) 统一向量化预计算
+        records = prepare_card_columns(page_df).to_dict('records')
+
+        # 整页卡片拼成一个HTML串，单次 st.markdown 发送
+        page_html = '<hr>'.join(build_article_card_html(record) for record in records)
+        st.markdown(page_html, unsafe_allow_html=True)
+
+
+@st.fragment
+def render_analysis_tab(df: pd.DataFrame):
+    """数据分析页"""
+    st.markdown("### 📈 数据分析")
+
+    # 全部聚合一次性预计算并按数据指纹缓存，交互重跑不再重复groupby
+    aggs = compute_analysis_aggregates(df)
+
+    # 类别分布
+    col1, col2 = st.columns(2)
+
+    with col1:
+        category_counts = aggs['category_counts']
+        fig = px.bar(
+            x=category_counts.index,
+            y=category_counts.values,
+            labels={'x': '类别', 'y': '文章数量'},
+            title='信息类别分布'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        subcategory_counts = aggs['subcategory_counts']
+        fig = px.bar(
+            x=subcategory_counts.values,
+            y=subcategory_counts.index,
+            orientation='h',
+            labels={'x': '文章数量', 'y': '产品/品牌'},
+            title='Top 10 产品/品牌'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    # 价值分数分布热图
+    st.markdown("---")
+    st.markdown("### 🔥 价值分布热图")
+
+    heatmap_data = aggs['heatmap_data']
+
+    fig = px.imshow(
+        heatmap_data,
+        labels=dict(x="产品/品牌", y="信息类别", color="平均价值分"),
+        aspect="auto",
+        color_continuous_scale="RdYlBu_r"
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 关键词词云（简单统计）
+    st.markdown("---")
+    st.markdown("### ☁️ 高频关键词")
+
+    keyword_counts = aggs['keyword_counts']
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        fig = px.bar(
+            x=keyword_counts.values,
+            y=keyword_counts.index,
+            orientation='h',
+            labels={'x': '出现次数', 'y': '关键词'},
+            title='Top 20 高频关键词'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("**关键词统计**")
+        st.metric("总关键词数", aggs['unique_keywords'])
+        st.metric("平均关键词/文章", f"{aggs['avg_keywords_per_article']:.1f}")
+
 
 # --- 主程序 ---
 def main():
@@ -541,8 +875,8 @@ def main():
         st.info("请先运行数据采集程序 `python main.py` 来收集情报数据")
         return
     
-    # 加载数据
-    df = db_manager.load_articles()
+    # 加载统计/分析所需的窄投影 (列表页数据由SQL按筛选条件单独取)
+    df = db_manager.load_articles_light()
     
     if df.empty:
         st.warning("📭 数据库中暂无数据")
@@ -552,142 +886,15 @@ def main():
     tab1, tab2, tab3 = st.tabs(["📊 数据总览", "📰 情报列表", "📈 数据分析"])
     
     with tab1:
-        # 显示统计仪表板
-        stats = db_manager.get_statistics(df)
-        render_statistics_dashboard(stats)
-    
+        render_overview_tab(db_manager, df)
+
     with tab2:
         # 获取筛选条件
         filters = render_sidebar_filters(df)
-        
-        # 应用筛选
-        filtered_df = apply_filters(df, filters)
-        
-        # 显示结果统计
-        col1, col2, col3 = st.columns([2, 1, 1])
-        with col1:
-            st.markdown(f"### 🔍 找到 **{len(filtered_df)}** 条相关情报")
-        with col2:
-            # 导出按钮
-            if st.button("📥 导出数据", use_container_width=True):
-                csv = filtered_df.to_csv(index=False, encoding='utf-8-sig')
-                st.download_button(
-                    label="下载CSV文件",
-                    data=csv,
-                    file_name=f'情报导出_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-                    mime='text/csv'
-                )
-        
-        st.markdown("---")
-        
-        # 显示文章列表
-        if filtered_df.empty:
-            st.info("😅 没有找到符合条件的情报，试试调整筛选条件？")
-        else:
-            # 分页显示
-            items_per_page = 10
-            total_pages = (len(filtered_df) - 1) // items_per_page + 1
-            
-            if 'page' not in st.session_state:
-                st.session_state.page = 0
-            
-            # 分页控制
-            col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
-            with col1:
-                if st.button("⬅️ 首页", disabled=st.session_state.page == 0):
-                    st.session_state.page = 0
-            with col2:
-                if st.button("◀️ 上一页", disabled=st.session_state.page == 0):
-                    st.session_state.page -= 1
-            with col3:
-                st.markdown(f"<center>第 {st.session_state.page + 1} / {total_pages} 页</center>", unsafe_allow_html=True)
-            with col4:
-                if st.button("下一页 ▶️", disabled=st.session_state.page >= total_pages - 1):
-                    st.session_state.page += 1
-            with col5:
-                if st.button("末页 ➡️", disabled=st.session_state.page >= total_pages - 1):
-                    st.session_state.page = total_pages - 1
-            
-            # 显示当前页的文章
-            start_idx = st.session_state.page * items_per_page
-            end_idx = min(start_idx + items_per_page, len(filtered_df))
-            
-            for idx in range(start_idx, end_idx):
-                render_article_card(filtered_df.iloc[idx])
-                if idx < end_idx - 1:
-                    st.markdown("---")
-    
+        render_article_list(db_manager, filters)
+
     with tab3:
-        st.markdown("### 📈 数据分析")
-        
-        # 类别分布
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            category_counts = df['category'].value_counts()
-            fig = px.bar(
-                x=category_counts.index,
-                y=category_counts.values,
-                labels={'x': '类别', 'y': '文章数量'},
-                title='信息类别分布'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            subcategory_counts = df['sub_category'].value_counts().head(10)
-            fig = px.bar(
-                x=subcategory_counts.values,
-                y=subcategory_counts.index,
-                orientation='h',
-                labels={'x': '文章数量', 'y': '产品/品牌'},
-                title='Top 10 产品/品牌'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # 价值分数分布热图
-        st.markdown("---")
-        st.markdown("### 🔥 价值分布热图")
-        
-        # 创建交叉表
-        heatmap_data = pd.crosstab(df['category'], df['sub_category'], values=df['value_score'], aggfunc='mean')
-        
-        fig = px.imshow(
-            heatmap_data,
-            labels=dict(x="产品/品牌", y="信息类别", color="平均价值分"),
-            aspect="auto",
-            color_continuous_scale="RdYlBu_r"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # 关键词词云（简单统计）
-        st.markdown("---")
-        st.markdown("### ☁️ 高频关键词")
-        
-        # 提取所有关键词
-        all_keywords = []
-        for keywords_str in df['keywords'].dropna():
-            keywords = [k.strip() for k in keywords_str.split(',') if k.strip()]
-            all_keywords.extend(keywords)
-        
-        # 统计关键词频率
-        keyword_counts = pd.Series(all_keywords).value_counts().head(20)
-        
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            fig = px.bar(
-                x=keyword_counts.values,
-                y=keyword_counts.index,
-                orientation='h',
-                labels={'x': '出现次数', 'y': '关键词'},
-                title='Top 20 高频关键词'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("**关键词统计**")
-            st.metric("总关键词数", len(set(all_keywords)))
-            st.metric("平均关键词/文章", f"{len(all_keywords)/len(df):.1f}")
+        render_analysis_tab(df)
 
 if __name__ == "__main__":
     main()
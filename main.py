@@ -1,4 +1,6 @@
+import hashlib
 import os
+import re
 import sqlite3
 import requests
 import json
@@ -6,6 +8,8 @@ import logging
 import time
 import threading
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
 from datetime import datetime
 from typing import List, Dict, Optional, Set
 from newspaper import Article, Config as NewspaperConfig
@@ -31,7 +35,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # --- 1. 数据模型定义 ---
-@dataclass
+# slots=True: 实例不再携带__dict__，字段访问走固定槽位，
+# 成百上千个实例的运行中内存占用约省一半
+@dataclass(slots=True)
 class NewsArticle:
     """新闻文章数据模型"""
     title: str
@@ -51,7 +57,7 @@ class NewsArticle:
         if self.created_at is None:
             self.created_at = datetime.now()
 
-@dataclass
+@dataclass(slots=True)
 class SearchTask:
     """搜索任务模型"""
     query: str
@@ -73,10 +79,15 @@ class AppConfig:
         # 关键: 构造数据库文件的绝对路径，确保无论从哪里运行脚本都能找到正确的文件
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.DB_FILE = os.path.join(script_dir, 'news.db')
-        self.MAX_WORKERS = 10
+        # 纯I/O负载，线程数不必绑死在10: 按CPU数放大并允许用环境变量覆盖，
+        # 真正的节流由各API客户端的RateLimiter负责
+        self.MAX_WORKERS = int(os.getenv("MAX_WORKERS", min(32, (os.cpu_count() or 1) * 8)))
         self.REQUEST_TIMEOUT = 20
         self.RETRY_COUNT = 3
         self.RETRY_DELAY = 2
+        # 各API的限速 (QPS)，在客户端发请求前排队，而不是在结果循环里统一sleep
+        self.GOOGLE_SEARCH_QPS = 5.0
+        self.DEEPSEEK_QPS = 10.0
         
         # 创建一个带重试逻辑的全局Session (新增)
         self.http_session = self._create_resilient_session()
@@ -93,7 +104,13 @@ class AppConfig:
             allowed_methods=["HEAD", "GET", "POST"],
             backoff_factor=1  # 重试间隔时间因子
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # 显式放大连接池: 默认每个host只有10个连接，并发线程一多就会
+        # 丢弃连接重新做TCP+TLS握手；池够大时热连接直接复用
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=32,
+            pool_maxsize=32
+        )
         session.mount("https://", adapter)
         session.mount("http://", adapter)
         return session
@@ -114,13 +131,40 @@ class AppConfig:
 # --- 3. 数据库管理 ---
 class DatabaseManager:
     """SQLite数据库管理类"""
+    # SQL定义成类常量: 语句文本稳定不变，配合连接的语句缓存只prepare一次
+    _INSERT_ARTICLE_SQL = '''
+        INSERT OR IGNORE INTO articles (
+            title, url, source, publish_date, author, sub_category, category,
+            summary, keywords, value_score, value_reason
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # 单条常驻连接 + 互斥锁: 免去每次操作的connect/teardown和PRAGMA重放，
+        # 页缓存在URL点查与批量写入之间保持热态；所有访问经锁串行化，
+        # 点查只有微秒级，串行化不构成瓶颈
         self._lock = threading.Lock()
+        self._conn = self._create_connection()
         self._init_database()
 
+    def _create_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL下NORMAL即可保证崩溃一致性，省掉每次commit的fsync等待
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        # 数据库层面也等锁5秒再报错，覆盖connect timeout管不到的场景
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+
+    def close(self):
+        self._conn.close()
+
     def _init_database(self):
         with self._get_connection() as conn:
+            # WAL持久化在数据库文件上，只需设置一次；写入不再阻塞dashboard的读连接
+            conn.execute('PRAGMA journal_mode=WAL')
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS articles (
                     id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, url TEXT UNIQUE NOT NULL,
@@ -133,45 +177,89 @@ class DatabaseManager:
             conn.execute('CREATE INDEX IF NOT EXISTS idx_publish_date ON articles(publish_date)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_value_score ON articles(value_score)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_category ON articles(category)')
+            # dashboard 按收录时间排序/按子分类过滤，补上对应索引避免全表扫描排序
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON articles(created_at DESC)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_sub_category ON articles(sub_category, created_at DESC)')
+            self._init_fts(conn)
             conn.commit()
+
+    def _init_fts(self, conn: sqlite3.Connection):
+        """创建FTS5全文索引供dashboard搜索框使用 (trigram分词，中英文子串均可命中索引)"""
+        try:
+            fts_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='articles_fts'"
+            ).fetchone()
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, summary, keywords,
+                    content='articles', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+            # 触发器保持索引与articles表同步
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts(rowid, title, summary, keywords)
+                    VALUES (new.id, new.title, new.summary, new.keywords);
+                END
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts(articles_fts, rowid, title, summary, keywords)
+                    VALUES ('delete', old.id, old.title, old.summary, old.keywords);
+                END
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE ON articles BEGIN
+                    INSERT INTO articles_fts(articles_fts, rowid, title, summary, keywords)
+                    VALUES ('delete', old.id, old.title, old.summary, old.keywords);
+                    INSERT INTO articles_fts(rowid, title, summary, keywords)
+                    VALUES (new.id, new.title, new.summary, new.keywords);
+                END
+            ''')
+            # 首次启用时回填已有数据
+            if not fts_exists:
+                conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5全文索引不可用，dashboard搜索将回退到LIKE扫描: {e}")
     
     @contextmanager
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path, timeout=10)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        with self._lock:
+            yield self._conn
     
-    def get_existing_urls(self) -> Set[str]:
+    def url_exists(self, url: str) -> bool:
+        """通过idx_url索引点查URL是否已入库，O(log N)且不随库增长占用内存"""
         with self._get_connection() as conn:
-            cursor = conn.execute('SELECT url FROM articles')
-            return {row['url'] for row in cursor}
-    
+            return conn.execute(
+                'SELECT 1 FROM articles WHERE url = ? LIMIT 1', (url,)
+            ).fetchone() is not None
+
+    def count_articles(self) -> int:
+        with self._get_connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
     def save_articles(self, articles: List[NewsArticle]) -> int:
         if not articles:
             return 0
-        with self._lock:
-            with self._get_connection() as conn:
-                saved_count = 0
-                for article in articles:
-                    try:
-                        conn.execute('''
-                            INSERT INTO articles (
-                                title, url, source, publish_date, author, sub_category, category,
-                                summary, keywords, value_score, value_reason
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            article.title, article.url, article.source, article.publish_date,
-                            article.author, article.sub_category, article.category, article.summary,
-                            article.keywords, article.value_score, article.value_reason
-                        ))
-                        saved_count += 1
-                    except sqlite3.IntegrityError:
-                        logger.warning(f"文章已存在: {article.url}")
-                conn.commit()
-                return saved_count
+        # INSERT OR IGNORE + executemany: 一个事务批量写入，
+        # 重复URL由UNIQUE约束直接跳过，省去逐行execute和异常往返
+        rows = [
+            (
+                article.title, article.url, article.source, article.publish_date,
+                article.author, article.sub_category, article.category, article.summary,
+                article.keywords, article.value_score, article.value_reason
+            )
+            for article in articles
+        ]
+        with self._get_connection() as conn:
+            # rowcount 只统计语句本身写入的行，不含FTS同步触发器的联动写入
+            cursor = conn.executemany(self._INSERT_ARTICLE_SQL, rows)
+            conn.commit()
+            saved_count = cursor.rowcount
+        skipped = len(rows) - saved_count
+        if skipped:
+            logger.warning(f"跳过 {skipped} 篇已存在的文章")
+        return saved_count
 
 # --- 4. 搜索策略管理 ---
 class SearchStrategyManager:
@@ -209,59 +297,107 @@ class SearchStrategyManager:
     }
     # 新增文件扩展名黑名单 (已优化)
     EXTENSION_BLACKLIST = {'.pdf', '.jpg', '.jpeg', '.png', '.gif', '.zip', '.rar', '.docx', '.xlsx', '.mp4', '.avi'}
+    # 预编译黑名单匹配结构: 精确命中走set查询，子域名 (www.youtube.com、m.facebook.com)
+    # 走带点前缀的endswith，既不会像子串匹配那样误伤 notyoutube.com 之类域名，
+    # 每次检查也只做一次元组endswith而非遍历整个黑名单
+    _BLACKLIST_SUFFIXES = tuple('.' + domain for domain in DOMAIN_BLACKLIST)
+    _EXTENSION_SUFFIXES = tuple(EXTENSION_BLACKLIST)
 
     @classmethod
+    @lru_cache(maxsize=1)
     def generate_search_tasks(cls) -> List[SearchTask]:
-        tasks = []
-        for target in cls.SEARCH_TARGETS:
-            for term in target["terms"]:
-                for modifier in cls.SEARCH_MODIFIERS:
-                    for mod_term in modifier["terms"]:
-                        query = f'"{term}" "{mod_term}"'
-                        tasks.append(SearchTask(query=query, sub_category=target["category"], type=modifier["type"]))
+        # 任务列表由类常量决定，进程内缓存一次生成结果即可 (调用方只读遍历)
+        # 用 dict 按 query 去重 (保留首个)，重复的检索词组合不再产生重复的付费API调用
+        tasks: Dict[str, SearchTask] = {}
+        for target, modifier in product(cls.SEARCH_TARGETS, cls.SEARCH_MODIFIERS):
+            for term, mod_term in product(target["terms"], modifier["terms"]):
+                query = f'"{term}" "{mod_term}"'
+                tasks.setdefault(query, SearchTask(query=query, sub_category=target["category"], type=modifier["type"]))
         for source in cls.TARGETED_SOURCES:
             for keyword in source["keywords"]:
                 query = f'"{keyword}" site:{source["domain"]}'
-                tasks.append(SearchTask(query=query, sub_category="行业动态", type=source["domain"]))
-        logger.info(f"生成了 {len(tasks)} 个搜索任务")
-        return tasks
+                tasks.setdefault(query, SearchTask(query=query, sub_category="行业动态", type=source["domain"]))
+        logger.info(f"生成了 {len(tasks)} 个搜索任务 (已按query去重)")
+        return list(tasks.values())
 
     @classmethod
     def is_url_blacklisted(cls, url: str) -> bool:
-        """检查URL的域名或文件扩展名是否在黑名单中 (已优化)"""
+        """检查URL的域名或文件扩展名是否在黑名单中 (已优化)
+
+        同一URL会在多个搜索词的结果里反复出现，lru_cache后重复检查
+        退化为一次字典查找，省掉urlparse的正则与对象分配。
+        """
+        return cls._is_url_blacklisted_cached(url)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_url_blacklisted_cached(url: str) -> bool:
+        cls = SearchStrategyManager
         if not url or not url.startswith(('http://', 'https://')):
             return True
+        # 裸URL直接以黑名单扩展名结尾的，先用C级endswith拦掉，不必进urlparse；
+        # 带查询串的情况仍由下面的path检查兜底
+        if url.lower().endswith(cls._EXTENSION_SUFFIXES):
+            logger.debug(f"URL文件类型被屏蔽: {url}")
+            return True
         try:
             parsed_url = urlparse(url)
-            domain = parsed_url.netloc
+            domain = parsed_url.netloc.lower()
             path = parsed_url.path.lower()
-            
-            # 检查域名
-            if any(blacklisted_domain in domain for blacklisted_domain in cls.DOMAIN_BLACKLIST):
+
+            # 检查域名 (精确命中或子域名后缀命中)
+            if domain in cls.DOMAIN_BLACKLIST or domain.endswith(cls._BLACKLIST_SUFFIXES):
                 logger.debug(f"URL域名被屏蔽: {url}")
                 return True
-            
+
             # 检查文件扩展名
-            if any(path.endswith(ext) for ext in cls.EXTENSION_BLACKLIST):
+            if path.endswith(cls._EXTENSION_SUFFIXES):
                 logger.debug(f"URL文件类型被屏蔽: {url}")
                 return True
-                
+
             return False
         except Exception as e:
             logger.warning(f"URL解析失败 '{url}', 错误: {e}. 将其视为黑名单URL.")
             return True
 
 # --- 5. API客户端 (已优化) ---
+class RateLimiter:
+    """线程安全的最小间隔限速器
+
+    按配置的QPS在发起请求前排队放行，取代as_completed循环里对所有任务
+    一刀切的固定sleep: 工作线程满速并行，只在触达配额时等待。
+    """
+    def __init__(self, max_per_second: float):
+        self._interval = 1.0 / max_per_second
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = (self._next_slot if wait > 0 else now) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
 class GoogleSearchClient:
     """Google搜索API客户端"""
-    def __init__(self, api_key: str, search_engine_id: str, session: requests.Session):
+    def __init__(self, api_key: str, search_engine_id: str, session: requests.Session, limiter: Optional[RateLimiter] = None):
         self.api_key = api_key
         self.search_engine_id = search_engine_id
         self.base_url = "https://www.googleapis.com/customsearch/v1"
         self.session = session  # 使用传入的带重试的session
+        self.limiter = limiter
 
     def search(self, query: str, num: int = 5) -> List[Dict]:
-        params = {'key': self.api_key, 'cx': self.search_engine_id, 'q': query, 'num': num}
+        params = {
+            'key': self.api_key, 'cx': self.search_engine_id, 'q': query, 'num': num,
+            # fields掩码让服务端裁掉snippet等用不到的分支，响应体和解析量都随之缩小；
+            # 下游只消费link/title/displayLink和metatags里的发布时间、作者
+            'fields': 'items(link,title,displayLink,pagemap/metatags)',
+        }
+        if self.limiter:
+            self.limiter.acquire()
         try:
             response = self.session.get(self.base_url, params=params, timeout=15)
             response.raise_for_status()
@@ -272,18 +408,64 @@ class GoogleSearchClient:
 
 class DeepSeekClient:
     """DeepSeek API客户端"""
-    def __init__(self, api_key: str, session: requests.Session):
+    def __init__(self, api_key: str, session: requests.Session, limiter: Optional[RateLimiter] = None):
         self.api_key = api_key
         self.base_url = "https://api.deepseek.com/chat/completions"
         self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
         self.session = session  # 使用传入的带重试的session
+        self.limiter = limiter
+        # 按内容哈希记住本次运行内的分析结果: 同一篇文章经不同URL出现时不再重复付费
+        self._analysis_cache: Dict[str, Dict] = {}
+        self._cache_lock = threading.Lock()
+
+    # 宽容提取: 模型偶尔会在JSON外包一段说明文字或```json围栏，
+    # 直接丢弃等于浪费一次付费调用，先按原样解析，失败再截取最外层{...}重试
+    _JSON_OBJECT_RE = re.compile(r'\{.*\}', re.S)
+
+    # 送入模型的正文截断长度 (约3000字符，控制prompt token成本)
+    TEXT_LIMIT = 3000
+
+    # 提示词模板定义在类属性上，每次调用只做一次format填充
+    ANALYZE_PROMPT_TMPL = """
+        你是一个专业的行业分析师兼个护小家电产品线负责人。请分析以下文章并评估其业务价值，严格按照JSON格式输出。
+
+        情报子分类: {sub_category}
+        文章标题: {title}
+        文章全文（部分）:
+        {text}
+
+        请执行以下任务：
+        1. **category**: 判断文章的核心类别。只能从以下选项中选择一个：["技术创新", "市场动态", "法规政策", "竞品分析", "用户反馈", "行业报告", "无关"]。
+        2. **summary**: 生成一段不超过200字的中文摘要，精准概括文章核心内容。
+        3. **keywords**: 提取3-5个最关键的中文关键词。
+        4. **score**: 对情报的业务价值打分，范围0-100。
+        5. **reason**: 用一句话简明扼要地解释打分原因。
+
+        输出格式必须是严格的JSON，如下所示：
+        {{
+          "category": "...",
+          "summary": "...",
+          "keywords": ["...", "...", "..."],
+          "score": ...,
+          "reason": "..."
+        }}
+        """
 
     def _make_request(self, prompt: str, temperature: float = 0.1) -> Optional[str]:
         response = None  # 修复: 在 try 块之前初始化 response
+        if self.limiter:
+            self.limiter.acquire()
         try:
             response = self.session.post(
                 self.base_url, headers=self.headers,
-                json={"model": "deepseek-chat", "messages": [{"role": "user", "content": prompt}], "temperature": temperature, "stream": False},
+                json={
+                    "model": "deepseek-chat",
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": temperature,
+                    "stream": False,
+                    # JSON模式: 模型保证输出合法JSON，基本不再走围栏/正则兜底路径
+                    "response_format": {"type": "json_object"},
+                },
                 timeout=45
             )
             response.raise_for_status()
@@ -305,52 +487,35 @@ class DeepSeekClient:
             if content.strip().startswith("```json"):
                 content = content.strip()[7:-3]
             return json.loads(content)
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON解析失败: {e}. 原始内容: {content[:500]}...")
+        except json.JSONDecodeError:
+            match = self._JSON_OBJECT_RE.search(content)
+            if match:
+                try:
+                    return json.loads(match.group(0))
+                except json.JSONDecodeError:
+                    pass
+            logger.error(f"JSON解析失败. 原始内容: {content[:500]}...")
             return None
 
-    def analyze_article(self, title: str, text: str) -> Optional[Dict]:
-        prompt = f"""
-        你是一个专业的行业分析师，专注于个护小家电领域。请分析以下文章，并严格按照JSON格式输出。
-
-        文章标题: {title}
-        文章全文（部分）:
-        {text[:3000]}
-
-        请执行以下任务：
-        1. **category**: 判断文章的核心类别。只能从以下选项中选择一个：["技术创新", "市场动态", "法规政策", "竞品分析", "用户反馈", "行业报告", "无关"]。
-        2. **summary**: 生成一段不超过200字的中文摘要，精准概括文章核心内容。
-        3. **keywords**: 提取3-5个最关键的中文关键词。
-
-        输出格式必须是严格的JSON，如下所示：
-        {{
-          "category": "...",
-          "summary": "...",
-          "keywords": ["...", "...", "..."]
-        }}
-        """
+    def analyze_and_evaluate(self, title: str, text: str, sub_category: str) -> Optional[Dict]:
+        """单次请求同时完成内容分析与价值评估，省掉每篇文章第二次API往返"""
+        if len(text) > self.TEXT_LIMIT:
+            text = text[:self.TEXT_LIMIT]
+        cache_key = hashlib.blake2b(
+            f"{sub_category}\x1f{title}\x1f{text}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        with self._cache_lock:
+            cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"命中分析缓存: {title[:50]}...")
+            return cached
+        prompt = self.ANALYZE_PROMPT_TMPL.format(sub_category=sub_category, title=title, text=text)
         content = self._make_request(prompt)
-        return self._parse_json_response(content)
-
-    def evaluate_value(self, summary: str, sub_category: str) -> Optional[Dict]:
-        prompt = f"""
-        你是一位经验丰富的个护小家电产品线负责人。请基于以下情报摘要，评估其对于我们业务的价值。
-
-        情报子分类: {sub_category}
-        情报摘要: {summary}
-
-        请执行以下任务：
-        1. **score**: 对情报的业务价值打分，范围0-100。
-        2. **reason**: 用一句话简明扼要地解释打分原因。
-
-        输出格式必须是严格的JSON：
-        {{
-            "score": ...,
-            "reason": "..."
-        }}
-        """
-        content = self._make_request(prompt)
-        return self._parse_json_response(content)
+        result = self._parse_json_response(content)
+        if result is not None:
+            with self._cache_lock:
+                self._analysis_cache[cache_key] = result
+        return result
 
 # --- 6. 文章处理器 (已优化) ---
 class ArticleProcessor:
@@ -360,11 +525,21 @@ class ArticleProcessor:
         self.deepseek_client = deepseek_client
     
     def fetch_article(self, url: str) -> Optional[Article]:
-        """抓取文章内容，并增加手动重试逻辑 (已优化)"""
+        """抓取文章内容，并增加手动重试逻辑 (已优化)
+
+        下载走全局带连接池的session (复用TCP/TLS连接、统一重试策略)，
+        拿到HTML后再交给newspaper解析，避免newspaper内部每篇文章新建连接。
+        """
+        headers = dict(self.config.newspaper_config.headers)
+        headers['User-Agent'] = self.config.newspaper_config.browser_user_agent
         for attempt in range(self.config.RETRY_COUNT):
             try:
+                response = self.config.http_session.get(
+                    url, headers=headers, timeout=self.config.REQUEST_TIMEOUT
+                )
+                response.raise_for_status()
                 article = Article(url, config=self.config.newspaper_config)
-                article.download()
+                article.download(input_html=response.text)
                 article.parse()
                 return article
             except Exception as e:
@@ -403,20 +578,16 @@ class ArticleProcessor:
         else:
             publish_date = "未知"
         
-        analysis = self.deepseek_client.analyze_article(title, article.text)
+        analysis = self.deepseek_client.analyze_and_evaluate(title, article.text, task.sub_category)
         if not analysis or analysis.get('category') == '无关':
             logger.debug(f"文章被AI过滤: {title[:50]}...")
             return None
-        
-        summary = analysis.get('summary', '')
-        evaluation = self.deepseek_client.evaluate_value(summary, task.sub_category)
-        value_score, value_reason = (evaluation.get('score', 0), evaluation.get('reason', '评估失败')) if evaluation else (0, '评估失败')
-        
+
         return NewsArticle(
             title=title, url=url, source=display_link, publish_date=publish_date,
             author=author, sub_category=task.sub_category, category=analysis.get('category', '其他'),
-            summary=summary, keywords=", ".join(analysis.get('keywords', [])),
-            value_score=value_score, value_reason=value_reason
+            summary=analysis.get('summary', ''), keywords=", ".join(analysis.get('keywords', [])),
+            value_score=analysis.get('score', 0), value_reason=analysis.get('reason', '评估失败')
         )
 
 # --- 7. 主程序 (已优化) ---
@@ -432,49 +603,75 @@ class NewsScraper:
         assert self.config.DEEPSEEK_API_KEY is not None
         
         self.google_client = GoogleSearchClient(
-            self.config.GOOGLE_API_KEY, self.config.SEARCH_ENGINE_ID, self.config.http_session
+            self.config.GOOGLE_API_KEY, self.config.SEARCH_ENGINE_ID, self.config.http_session,
+            limiter=RateLimiter(self.config.GOOGLE_SEARCH_QPS)
+        )
+        self.deepseek_client = DeepSeekClient(
+            self.config.DEEPSEEK_API_KEY, self.config.http_session,
+            limiter=RateLimiter(self.config.DEEPSEEK_QPS)
         )
-        self.deepseek_client = DeepSeekClient(self.config.DEEPSEEK_API_KEY, self.config.http_session)
         self.article_processor = ArticleProcessor(self.config, self.deepseek_client)
-        self.existing_urls = self.db_manager.get_existing_urls()
-    
-    def process_search_task(self, task: SearchTask) -> List[NewsArticle]:
+        # 本次运行内跨任务去重用的小集合 (文章统一在运行结束时落库，仅靠DB点查
+        # 拦不住同一轮里重复出现的URL)；历史URL不再全量加载，改为按需点查数据库
+        self._seen_urls: Set[str] = set()
+        self._seen_urls_lock = threading.Lock()
+
+    def _should_process(self, url: str) -> bool:
+        with self._seen_urls_lock:
+            if url in self._seen_urls:
+                return False
+            self._seen_urls.add(url)
+        return not self.db_manager.url_exists(url)
+
+    def collect_search_results(self, task: SearchTask) -> List[tuple]:
+        """执行一次搜索，返回过滤去重后的 (搜索结果, 任务) 候选对
+
+        黑名单和去重都在这里出清: 先查黑名单 (纯内存)，再做seen集合/DB点查，
+        被过滤的URL不会进入处理阶段，也就不会占用抓取和LLM调用。
+        """
         logger.info(f"执行搜索: {task.query}")
         search_results = self.google_client.search(task.query, num=10)
-        if not search_results:
-            return []
-        
-        articles = []
-        for result in search_results:
-            url = result.get('link')
-            if url and url not in self.existing_urls:
-                self.existing_urls.add(url) # 提前加入，避免并发任务重复处理
-                article = self.article_processor.process_single_article(result, task)
-                if article:
-                    articles.append(article)
-                    logger.info(f"成功处理: {article.title[:50]}... (价值分: {article.value_score})")
-        return articles
-    
+        return [
+            (result, task) for result in search_results
+            if (url := result.get('link'))
+            and not SearchStrategyManager.is_url_blacklisted(url)
+            and self._should_process(url)
+        ]
+
     def run(self):
         logger.info("🚀 开始执行情报抓取任务...")
-        logger.info(f"📊 数据库中已存在 {len(self.existing_urls)} 条记录")
-        
+        logger.info(f"📊 数据库中已存在 {self.db_manager.count_articles()} 条记录")
+
         search_tasks = SearchStrategyManager.generate_search_tasks()
         all_articles = []
-        
+
+        # 两阶段流水线: 先并行跑完所有搜索拿到候选文章，再把每篇文章作为
+        # 独立任务投入线程池。原来一个搜索任务内的文章是串行处理的，结果
+        # 少数命中多的任务拖着整个池子收尾；按文章切分后抓取和AI分析在
+        # 全部候选之间重叠，池子始终满载
         with ThreadPoolExecutor(max_workers=self.config.MAX_WORKERS) as executor:
-            future_to_task = {executor.submit(self.process_search_task, task): task for task in search_tasks}
-            
-            progress_bar = tqdm(as_completed(future_to_task), total=len(search_tasks), desc="处理搜索任务")
-            for future in progress_bar:
+            pending: List[tuple] = []
+            future_to_task = {executor.submit(self.collect_search_results, task): task for task in search_tasks}
+            for future in tqdm(as_completed(future_to_task), total=len(search_tasks), desc="执行搜索任务"):
                 try:
-                    articles = future.result()
-                    if articles:
-                        all_articles.extend(articles)
+                    pending.extend(future.result())
                 except Exception as e:
                     task = future_to_task[future]
                     logger.error(f"任务 '{task.query}' 执行失败: {e}", exc_info=True)
-                time.sleep(0.5) # 轻微延时，避免过于频繁
+
+            logger.info(f"🔍 搜索完成，共 {len(pending)} 篇候选文章待处理")
+            future_to_url = {
+                executor.submit(self.article_processor.process_single_article, result, task): result.get('link')
+                for result, task in pending
+            }
+            for future in tqdm(as_completed(future_to_url), total=len(future_to_url), desc="处理文章"):
+                try:
+                    article = future.result()
+                    if article:
+                        all_articles.append(article)
+                        logger.info(f"成功处理: {article.title[:50]}... (价值分: {article.value_score})")
+                except Exception as e:
+                    logger.error(f"文章 '{future_to_url[future]}' 处理失败: {e}", exc_info=True)
         
         if all_articles:
             saved_count = self.db_manager.save_articles(all_articles)
@@ -492,4 +689,7 @@ class NewsScraper:
 # --- 8. 程序入口 ---
 if __name__ == "__main__":
     scraper = NewsScraper()
-    scraper.run()
+    try:
+        scraper.run()
+    finally:
+        scraper.db_manager.close()